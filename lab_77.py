@@ -1,15 +1,86 @@
 import re
+import email.message
+import os
+import shutil
+import sys
+import urllib.parse
 import urllib.request
 import urllib.error
-from typing import Optional
+from contextlib import contextmanager
+from typing import Iterable, Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Определение кодировки: cchardet быстрее, charset_normalizer ставится вместе с requests
+try:
+    import cchardet as _chardet
+except ImportError:
+    import charset_normalizer as _chardet
+
+
+# Префиксы, по которым строка считается URL
+_URL_PREFIXES = ("http://", "https://", "ftp://", "file://")
+_HTTP_PREFIXES = ("http://", "https://")
+
+# Регулярное выражение для поиска URL в HTML (компилируется один раз).
+# Работает с байтами: паттерны ASCII, декодировать страницу не нужно.
+# Альтернативы объединены, чтобы HTML просматривался за один проход:
+# href="http://...", src="http://...", url(http://...) и ссылки без кавычек
+# Без re.IGNORECASE поиск заметно быстрее: схемы http/https в ссылках на практике
+# в нижнем регистре, а URL из атрибутов в верхнем регистре (HREF=...) все равно
+# находит последняя, общая альтернатива.
+_ALL_URLS_RE = re.compile(
+    rb'''href=["'](https?://[^"']+)["']'''
+    rb'''|src=["'](https?://[^"']+)["']'''
+    rb'''|url\(["']?(https?://[^"')]+)["']?\)'''
+    rb'''|(https?://[^\s<>"']+)''',
+    re.ASCII  # \s - только ASCII-пробелы, без таблиц Unicode
+)
+
+# Меньше этого числа не-ASCII байтов детектор кодировки часто ошибается
+# (короткий текст в cp1251 он принимает, например, за Big5)
+_MIN_DETECT_BYTES = 128
+_ASCII_BYTES = bytes(range(128))
+
+# Размер буфера для файлового ввода-вывода (вместо стандартных 8 КиБ)
+_IO_BUFSIZE = 128 * 1024
+
+# Размер блока при потоковой записи ответа в файл
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+# Заголовки запросов: не блокировали как бота и отдавали сжатый ответ
+# (данных по сети в разы меньше, распаковка быстрее загрузки)
+_DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept-Encoding': 'gzip, deflate'
+}
+
+# Общая сессия для HTTP(S): соединения с серверами переиспользуются (keep-alive),
+# при сбое соединения запрос повторяется с небольшой задержкой
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.3)
+)
+_SESSION.mount('http://', _ADAPTER)
+_SESSION.mount('https://', _ADAPTER)
 
 
 class MyFile:
     """
     Класс для работы с файлами и URL.
     Поддерживает режимы: read, write, append, url.
+    
+    Методы read() и write() сами закрывают файл. При работе с открытым
+    файлом используйте контекстный менеджер: with MyFile(path, "write") as f: ...
     """
     
+    __slots__ = ('path', 'mode', 'file', '_cached_body', '_cached_charset', '_cached_text',
+                 '_scheme', '_host', '_url_path')
+    
     def __init__(self, path: str, mode: str = "read"):
         """
         Инициализация объекта MyFile.
@@ -24,6 +95,9 @@ class MyFile:
         self.path = path
         self.mode = mode.lower()
         self.file = None
+        self._cached_body: Optional[Union[bytes, bytearray]] = None  # Загруженное содержимое URL
+        self._cached_charset: Optional[str] = None  # Кодировка из заголовка ответа
+        self._cached_text: Optional[str] = None  # Декодированное содержимое URL
         
         # Проверяем допустимость режима
         valid_modes = ["read", "write", "append", "url"]
@@ -33,20 +107,25 @@ class MyFile:
         # Если режим url, проверяем что передан URL
         if self.mode == "url" and not self._is_url(path):
             raise ValueError(f"'{path}' не является валидным URL для режима 'url'")
+        
+        # Разбираем URL один раз, чтобы не делать этого при каждом обращении
+        self._scheme = self._host = self._url_path = None
+        if self.mode == "url":
+            parts = urllib.parse.urlsplit(path)
+            self._scheme, self._host, self._url_path = parts.scheme, parts.netloc, parts.path
     
     def _is_url(self, path: str) -> bool:
         """Проверяет, является ли строка URL."""
-        url_patterns = ["http://", "https://", "ftp://", "file://"]
-        return any(path.startswith(pattern) for pattern in url_patterns)
+        return path.startswith(_URL_PREFIXES)
     
     def _open_file(self):
         """Открывает файл в соответствии с режимом."""
         if self.mode == "read":
-            self.file = open(self.path, 'r', encoding='utf-8')
+            self.file = open(self.path, 'r', encoding='utf-8', buffering=_IO_BUFSIZE)
         elif self.mode == "write":
-            self.file = open(self.path, 'w', encoding='utf-8')
+            self.file = open(self.path, 'w', encoding='utf-8', buffering=_IO_BUFSIZE)
         elif self.mode == "append":
-            self.file = open(self.path, 'a', encoding='utf-8')
+            self.file = open(self.path, 'a', encoding='utf-8', buffering=_IO_BUFSIZE)
     
     def _close_file(self):
         """Закрывает файл, если он открыт."""
@@ -77,38 +156,106 @@ class MyFile:
         finally:
             self._close_file()
     
-    def write(self, content: str) -> bool:
+    def write(self, content: Union[str, Iterable[str]]) -> bool:
         """
         Записывает содержимое в файл.
         
         Args:
-            content: Строка для записи
+            content: Строка для записи или итерируемый набор строк
+                (каждая строка записывается с переводом строки в конце).
+                В режиме 'write' строки сначала собираются целиком, чтобы
+                прерванный ввод не стер существующий файл.
             
         Returns:
             bool: True если запись успешна
             
         Raises:
-            ValueError: Если объект не в режиме 'write' или 'append'
+            ValueError: Если объект не в режиме 'write' или 'append', либо content
+                не строка и не набор строк
             IOError: Если файл не может быть записан
+            
+        Ошибки, возникшие при получении строк из набора (например, при вводе),
+        пробрасываются как есть.
         """
         if self.mode not in ["write", "append"]:
             raise ValueError(f"Метод write() доступен только в режимах 'write' или 'append', текущий режим: '{self.mode}'")
         
+        if not isinstance(content, (str, Iterable)):
+            raise ValueError(f"Содержимое должно быть строкой или набором строк, получено: {type(content).__name__}")
+        
+        # Перезапись обнуляет файл при открытии, поэтому строки получаем и проверяем
+        # заранее: ошибка или прерывание при их получении оставит файл нетронутым
+        if self.mode == "write" and not isinstance(content, str):
+            content = list(content)
+            for line in content:
+                self._check_line(line)
+        
         try:
             self._open_file()
-            self.file.write(content)
+            if isinstance(content, str):
+                self.file.write(content)
+            else:
+                # Пишем строки по мере поступления, буферизацию оставляем файлу
+                for line in content:
+                    self._check_line(line)
+                    self.file.write(line)
+                    self.file.write("\n")
             return True
         except PermissionError:
             raise IOError(f"Нет прав на запись в файл '{self.path}'")
-        except Exception as e:
+        except (OSError, UnicodeError) as e:
+            # Ошибки источника строк (например, ввода) пробрасываются как есть
             raise IOError(f"Ошибка при записи в файл: {e}")
         finally:
             self._close_file()
     
+    def _check_line(self, line) -> None:
+        """Проверяет, что элемент набора строк для write() является строкой."""
+        if not isinstance(line, str):
+            raise ValueError(f"Строка для записи должна иметь тип str, получено: {type(line).__name__}")
+    
+    def copy_to(self, dest_path: str) -> bool:
+        """
+        Копирует файл в dest_path побайтно, без декодирования в строку.
+        
+        Копирование выполняет shutil.copyfile: в Linux данные передаются ядром
+        через os.sendfile, на других системах - буферизованными блоками.
+        
+        Args:
+            dest_path: Путь к файлу назначения
+            
+        Returns:
+            bool: True если копирование успешно
+            
+        Raises:
+            ValueError: Если объект не в режиме 'read'
+            IOError: Если файл не существует или не может быть скопирован
+        """
+        if self.mode != "read":
+            raise ValueError(f"Метод copy_to() доступен только в режиме 'read', текущий режим: '{self.mode}'")
+        
+        try:
+            shutil.copyfile(self.path, dest_path)
+            return True
+        except shutil.SameFileError:
+            raise IOError(f"Файл '{self.path}' нельзя скопировать сам в себя")
+        except FileNotFoundError as e:
+            if e.filename == dest_path:
+                raise IOError(f"Не найден каталог для файла назначения '{dest_path}'")
+            raise IOError(f"Файл '{self.path}' не найден")
+        except PermissionError:
+            raise IOError(f"Нет прав на копирование файла '{self.path}' в '{dest_path}'")
+        except Exception as e:
+            raise IOError(f"Ошибка при копировании файла: {e}")
+    
     def read_url(self) -> str:
         """
         Читает содержимое веб-страницы по URL.
         
+        Содержимое загружается один раз и кэшируется в объекте,
+        повторные вызовы (в том числе из count_urls и write_url) не обращаются к сети.
+        Для повторной загрузки используйте invalidate().
+        
         Returns:
             str: HTML-содержимое страницы
             
@@ -119,32 +266,30 @@ class MyFile:
         if self.mode != "url":
             raise ValueError(f"Метод read_url() доступен только в режиме 'url', текущий режим: '{self.mode}'")
         
+        if self._cached_text is None:
+            content = self._read_url_bytes()
+            self._cached_text = self._decode_content(content, self._cached_charset)
+        return self._cached_text
+    
+    def _read_url_bytes(self) -> Union[bytes, bytearray]:
+        """Возвращает тело ответа без декодирования (загружает страницу один раз)."""
+        if self._cached_body is not None:
+            return self._cached_body
+        
         try:
-            # Устанавливаем заголовки, чтобы не блокировали как бота
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            req = urllib.request.Request(self.path, headers=headers)
-            
-            with urllib.request.urlopen(req, timeout=10) as response:
-                # Пытаемся определить кодировку
-                content = response.read()
-                
-                # Пробуем разные кодировки
-                encodings = ['utf-8', 'cp1251', 'koi8-r', 'iso-8859-1']
-                
-                for encoding in encodings:
-                    try:
-                        return content.decode(encoding)
-                    except UnicodeDecodeError:
-                        continue
-                
-                # Если ни одна кодировка не подошла, возвращаем как utf-8 с заменой ошибок
-                return content.decode('utf-8', errors='replace')
+            with self._open_url() as response:
+                self._cached_body = response.read()
+                self._cached_charset = self._declared_charset(response)
+            return self._cached_body
                 
+        except requests.exceptions.HTTPError as e:
+            raise IOError(f"HTTP ошибка {e.response.status_code}: {e.response.reason} для URL {self.path}")
         except urllib.error.HTTPError as e:
             raise IOError(f"HTTP ошибка {e.code}: {e.reason} для URL {self.path}")
+        except requests.exceptions.Timeout:
+            raise IOError(f"Таймаут при загрузке URL {self.path}")
+        except requests.exceptions.ConnectionError as e:
+            raise IOError(f"Ошибка URL: {e} для URL {self.path}")
         except urllib.error.URLError as e:
             raise IOError(f"Ошибка URL: {e.reason} для URL {self.path}")
         except TimeoutError:
@@ -152,6 +297,61 @@ class MyFile:
         except Exception as e:
             raise IOError(f"Ошибка при чтении URL: {e}")
     
+    def invalidate(self):
+        """Сбрасывает кэш содержимого URL, следующий read_url() загрузит страницу заново."""
+        self._cached_body = None
+        self._cached_charset = None
+        self._cached_text = None
+    
+    def _decode_content(self, content: Union[bytes, bytearray], declared: Optional[str]) -> str:
+        """Декодирует содержимое страницы в строку."""
+        # Кодировка, указанная сервером в Content-Type, не требует угадывания
+        if declared:
+            try:
+                return content.decode(declared, errors='replace')
+            except LookupError:
+                pass  # Неизвестное имя кодировки - определяем сами
+        
+        # Чаще всего страница в UTF-8: строгая проверка - один проход в C
+        try:
+            return content.decode('utf-8')
+        except UnicodeDecodeError:
+            pass
+        
+        # На коротком тексте детектору не хватает статистики - считаем его cp1251
+        if len(content.translate(None, _ASCII_BYTES)) < _MIN_DETECT_BYTES:
+            return content.decode('cp1251', errors='replace')
+        
+        # Иначе определяем кодировку за один проход по содержимому
+        # (cchardet принимает только bytes, поэтому bytearray приводим явно)
+        encoding = _chardet.detect(bytes(content))['encoding'] or 'utf-8'
+        return content.decode(encoding, errors='replace')
+    
+    def _declared_charset(self, response) -> Optional[str]:
+        """Возвращает кодировку из заголовка Content-Type ответа, если она указана."""
+        message = email.message.Message()
+        message['Content-Type'] = response.headers.get('Content-Type', '')
+        return message.get_content_charset()
+    
+    @contextmanager
+    def _open_url(self):
+        """
+        Открывает URL и возвращает файлоподобный объект с телом ответа.
+        
+        HTTP(S) запросы идут через общую сессию с переиспользованием соединений,
+        остальные схемы (ftp://, file://) открываются через urllib.
+        """
+        if self._scheme in ("http", "https"):
+            with _SESSION.get(self.path, headers=_DEFAULT_HEADERS, timeout=10, stream=True) as response:
+                response.raise_for_status()
+                # Тело читается напрямую из сокета, gzip/deflate распаковываются на лету
+                response.raw.decode_content = True
+                yield response.raw
+        else:
+            req = urllib.request.Request(self.path, headers=_DEFAULT_HEADERS)
+            with urllib.request.urlopen(req, timeout=10) as response:
+                yield response
+    
     def count_urls(self) -> int:
         """
         Подсчитывает количество URL-адресов на веб-странице.
@@ -166,26 +366,12 @@ class MyFile:
             raise ValueError(f"Метод count_urls() доступен только в режиме 'url', текущий режим: '{self.mode}'")
         
         try:
-            html_content = self.read_url()
-            
-            # Регулярное выражение для поиска URL в HTML
-            # Ищем ссылки в href, src и других атрибутах
-            url_patterns = [
-                r'href=["\'](https?://[^"\']+)["\']',  # href="http://..."
-                r'src=["\'](https?://[^"\']+)["\']',   # src="http://..."
-                r'url\(["\']?(https?://[^"\')]+)["\']?\)',  # url(http://...)
-            ]
-            
-            urls = set()  # Используем set чтобы избежать дубликатов
+            # Паттерны ASCII, поэтому ищем прямо в байтах без декодирования
+            html_content = self._read_url_bytes()
             
-            for pattern in url_patterns:
-                found_urls = re.findall(pattern, html_content, re.IGNORECASE)
-                urls.update(found_urls)
-            
-            # Также ищем ссылки без кавычек (более общий паттерн)
-            general_pattern = r'https?://[^\s<>"\']+'
-            general_urls = re.findall(general_pattern, html_content, re.IGNORECASE)
-            urls.update(general_urls)
+            # Используем set чтобы избежать дубликатов; в каждом совпадении
+            # заполнена ровно одна группа, и это последняя сработавшая группа
+            urls = {match.group(match.lastindex) for match in _ALL_URLS_RE.finditer(html_content)}
             
             return len(urls)
             
@@ -198,6 +384,9 @@ class MyFile:
         """
         Сохраняет содержимое веб-страницы в файл.
         
+        Использует тот же кэш, что и read_url(): уже загруженная страница
+        не запрашивается повторно, а загруженная здесь - остается в кэше.
+        
         Args:
             filepath: Путь к файлу для сохранения
             
@@ -212,21 +401,50 @@ class MyFile:
             raise ValueError(f"Метод write_url() доступен только в режиме 'url', текущий режим: '{self.mode}'")
         
         try:
-            # Читаем содержимое URL
-            content = self.read_url()
-            
-            # Создаем объект для записи в файл
-            file_writer = MyFile(filepath, "write")
-            success = file_writer.write(content)
-            
-            if success:
-                print(f"Содержимое URL успешно сохранено в файл: {filepath}")
+            if self._cached_body is not None:
+                # Страница уже загружена - повторно в сеть не обращаемся
+                with self._replace_file(filepath) as file:
+                    file.write(self._cached_body)
+            else:
+                # Копируем тело ответа в файл блоками, без декодирования в строку,
+                # и заодно кэшируем его для read_url() и count_urls()
+                body = bytearray()
+                with self._open_url() as response, self._replace_file(filepath) as file:
+                    while True:
+                        chunk = response.read(_STREAM_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        file.write(chunk)
+                        body += chunk
+                    charset = self._declared_charset(response)
+                self._cached_body, self._cached_charset = body, charset
             
-            return success
+            print(f"Содержимое URL успешно сохранено в файл: {filepath}")
+            return True
             
         except Exception as e:
             raise IOError(f"Ошибка при сохранении содержимого URL в файл: {e}")
     
+    @contextmanager
+    def _replace_file(self, filepath: str):
+        """
+        Открывает временный файл рядом с filepath для записи байтов.
+        
+        Только после успешной записи временный файл заменяет filepath, поэтому
+        обрыв загрузки не портит уже существующий файл.
+        """
+        tmp_path = f"{filepath}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb', buffering=_IO_BUFSIZE) as file:
+                yield file
+            if os.path.exists(filepath):
+                shutil.copymode(filepath, tmp_path)  # Сохраняем права существующего файла
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
     def __enter__(self):
         """Поддержка контекстного менеджера."""
         if self.mode in ["read", "write", "append"]:
@@ -240,10 +458,6 @@ class MyFile:
     
     def __repr__(self):
         return f"MyFile(path='{self.path}', mode='{self.mode}')"
-    
-    def __del__(self):
-        """Деструктор - закрывает файл при удалении объекта."""
-        self._close_file()
 
 
 def display_menu():
@@ -257,6 +471,20 @@ def display_menu():
     print("=" * 50)
 
 
+def _input_lines():
+    """Построчно читает ввод пользователя до пустой строки или 'END'."""
+    line_num = 1
+    while True:
+        try:
+            line = input(f"Строка {line_num}: ").strip()
+        except EOFError:
+            return  # Конец ввода (Ctrl-D / Ctrl-Z) - как пустая строка
+        if line == "" or line.upper() == "END":
+            return
+        yield line
+        line_num += 1
+
+
 def file_operations():
     """Обрабатывает операции с файлами."""
     print("\n" + "-" * 30)
@@ -300,23 +528,29 @@ def file_operations():
             
         elif mode in ["write", "append"]:
             # Запись или добавление в файл
-            print(f"\nВведите содержимое для {'записи' if mode == 'write' else 'добавления'}:")
-            print("(Для завершения ввода введите пустую строку или 'END' на отдельной строке)")
-            print("-" * 40)
+            print("\nВыберите способ ввода:")
+            print("1. Построчный ввод")
+            print("2. Вставка текста целиком (для больших объемов)")
             
-            lines = []
-            line_num = 1
-            while True:
-                line = input(f"Строка {line_num}: ").strip()
-                if line == "" or line.upper() == "END":
-                    break
-                lines.append(line)
-                line_num += 1
+            input_choice = input("Введите номер (1-2): ").strip()
             
-            content = "\n".join(lines)
+            if input_choice not in ["1", "2"]:
+                print("Ошибка: неверный выбор способа ввода")
+                return
             
-            # Выполняем запись
-            success = file_obj.write(content)
+            print(f"\nВведите содержимое для {'записи' if mode == 'write' else 'добавления'}:")
+            
+            if input_choice == "2":
+                # Читаем весь вставленный текст одним вызовом до конца ввода
+                print("(Вставьте текст и завершите ввод: Ctrl-D, в Windows - Ctrl-Z и Enter)")
+                print("-" * 40)
+                success = file_obj.write(sys.stdin.read())
+            else:
+                print("(Для завершения ввода введите пустую строку или 'END' на отдельной строке)")
+                print("-" * 40)
+                
+                # Выполняем запись строк по мере их ввода
+                success = file_obj.write(_input_lines())
             if success:
                 action = "записано" if mode == "write" else "добавлено"
                 print(f"\n✓ Содержимое успешно {action} в файл '{file_path}'")
@@ -335,7 +569,7 @@ def url_operations():
     url = input("Введите URL (например, https://example.com): ").strip()
     
     # Проверяем, что URL начинается с протокола
-    if not url.startswith(("http://", "https://")):
+    if not url.startswith(_HTTP_PREFIXES):
         url = "https://" + url
     
     try:
@@ -369,8 +603,7 @@ def url_operations():
             save_path = input("Введите путь для сохранения файла: ").strip()
             if not save_path:
                 # Генерируем имя файла на основе URL
-                domain = url.split("//")[-1].split("/")[0]
-                save_path = f"{domain}_content.html"
+                save_path = f"{url_obj._host}_content.html"
             
             success = url_obj.write_url(save_path)
             if success: